@@ -1,31 +1,111 @@
 """Database configuration and session management."""
 
+import logging
+from collections.abc import AsyncIterator
+import orjson
+from sqlalchemy import DDL, DateTime, Index, delete, event, func, inspect, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
-    pass
+    
+    # Fetch database-generated values (timestamps) with RETURNING on INSERT
+    # and UPDATE instead of expiring them, so they can be read without
+    # another query
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # Keep sub-second precision, like the Python-side timestamps
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+# Trigram (gin_trgm_ops) indexes on PostgreSQL need the pg_trgm extension
+CREATE_PG_TRGM = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+event.listen(
+    Base.metadata,
+    "before_create",
+    CREATE_PG_TRGM.execute_if(dialect="postgresql"),
+)
 
 
 # Import models to register them with Base.metadata
 # This must be done after Base is defined
 def _import_models():
     """Import all models to register them with SQLAlchemy."""
-    from app.models import food, food_cache, recipe, meal, goal, preferences, week_plan  # noqa: F401
+    # app.models is the single registry of model modules
+    import app.models  # noqa: F401
 
 _import_models()
 
 
 # Create async engine
 settings = get_settings()
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+engine_options = {
+    "echo": settings.db_echo,
+    # Room for every distinct compiled statement in the app, so hot queries
+    # are never evicted and recompiled
+    "query_cache_size": settings.db_query_cache_size,
+    # JSON columns are (de)serialized with orjson instead of the stdlib json
+    "json_serializer": lambda value: orjson.dumps(value).decode(),
+    "json_deserializer": orjson.loads,
+}
+if ":memory:" not in settings.database_url:
+    # aiosqlite falls back to NullPool (a new connection per checkout) for
+    # file databases, so configure a sized pool of warm connections explicitly.
+    engine_options.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+engine = create_async_engine(settings.database_url, **engine_options)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so reads don't block on writes, and relax per-commit fsync."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.close()
+
+# INSERT construct with ON CONFLICT support for the configured backend
+if engine.dialect.name == "postgresql":
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+else:
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -35,13 +115,145 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+# Indexes that earlier versions created but the models no longer declare;
+# init_db drops them from existing databases so they stop costing writes
+OBSOLETE_INDEXES = {
+    "food_cache": ("ix_food_cache_search_query", "ix_food_cache_is_saved"),
+    "meals": ("ix_meals_date",),
+    "week_plans": ("ix_week_plans_status",),
+}
+
+
+def _applies_to(index: Index, sync_conn) -> bool:
+    """Whether the index is created on this database.
+    
+    Dialect-specific indexes record their dialect in info["dialect"] next to
+    their ddl_if, so e.g. PostgreSQL-only indexes are never reported missing
+    on SQLite.
+    """
+    dialect = index.info.get("dialect")
+    return dialect is None or dialect == sync_conn.dialect.name
+
+
+def _schema_changes(sync_conn) -> tuple[bool, list[Index], list[str]]:
+    """Inspect the database once for missing tables and indexes and for obsolete indexes."""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    tables_missing = False
+    missing_indexes: list[Index] = []
+    obsolete_indexes: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            # create_all emits the table's indexes along with it
+            tables_missing = True
+            continue
+        existing_indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        missing_indexes.extend(
+            index for index in table.indexes
+            if index.name not in existing_indexes and _applies_to(index, sync_conn)
+        )
+        obsolete_indexes.extend(
+            name for name in OBSOLETE_INDEXES.get(table.name, ())
+            if name in existing_indexes
+        )
+    return tables_missing, missing_indexes, obsolete_indexes
+
+
+def _merge_duplicate_meals(sync_conn) -> None:
+    """Merge meals sharing a date and type into the one with the lowest id.
+    
+    Databases created before ux_meals_date_meal_type existed may hold such
+    duplicates, which would make building the index fail. Entries move to the
+    kept meal, notes are combined and totals recalculated.
+    """
+    meals = Base.metadata.tables["meals"]
+    entries = Base.metadata.tables["meal_entries"]
+    duplicates = sync_conn.execute(
+        select(meals.c.date, meals.c.meal_type)
+        .group_by(meals.c.date, meals.c.meal_type)
+        .having(func.count() > 1)
+    ).all()
+    
+    for meal_date, meal_type in duplicates:
+        group = sync_conn.execute(
+            select(meals.c.id, meals.c.notes)
+            .where(meals.c.date == meal_date, meals.c.meal_type == meal_type)
+            .order_by(meals.c.id)
+        ).all()
+        keep_id = group[0].id
+        merged_ids = [meal.id for meal in group[1:]]
+        notes = "\n".join(meal.notes for meal in group if meal.notes) or None
+        
+        sync_conn.execute(
+            update(entries)
+            .where(entries.c.meal_id.in_(merged_ids))
+            .values(meal_id=keep_id)
+        )
+        sync_conn.execute(delete(meals).where(meals.c.id.in_(merged_ids)))
+        
+        def entry_sum(column):
+            return (
+                select(func.coalesce(func.sum(column), 0))
+                .where(entries.c.meal_id == keep_id)
+                .scalar_subquery()
+            )
+        
+        sync_conn.execute(
+            update(meals)
+            .where(meals.c.id == keep_id)
+            .values(
+                notes=notes,
+                total_calories=entry_sum(entries.c.calories),
+                total_protein=entry_sum(entries.c.protein),
+                total_carbs=entry_sum(entries.c.carbs),
+                total_fat=entry_sum(entries.c.fat),
+            )
+        )
+        logger.warning(
+            "Merged meals %s into meal %d (%s %s) before creating ux_meals_date_meal_type",
+            merged_ids, keep_id, meal_date, meal_type,
+        )
+
+
 async def init_db():
-    """Initialize the database by creating all tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Initialize the database: create missing tables and indexes, drop obsolete ones.
+    
+    An up-to-date schema costs a single inspection on startup; DDL is only
+    issued for what is actually missing.
+    """
+    logger.info("Database pool: %s", engine.pool.status())
+    async with engine.connect() as conn:
+        tables_missing, missing_indexes, obsolete_indexes = await conn.run_sync(
+            _schema_changes
+        )
+    
+    if tables_missing:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    
+    # create_all only emits indexes along with the tables it creates, so add
+    # indexes declared after an existing database was first created
+    if missing_indexes and engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            # The before_create hook only runs with create_all
+            await conn.execute(CREATE_PG_TRGM)
+    # A failure (e.g. rows violating a new unique index) stops startup instead
+    # of leaving the index missing
+    for index in missing_indexes:
+        async with engine.begin() as conn:
+            if index.name == "ux_meals_date_meal_type":
+                await conn.run_sync(_merge_duplicate_meals)
+            # Honors dialect-specific indexes declared with ddl_if
+            await conn.run_sync(index.create, checkfirst=True)
+    
+    if obsolete_indexes:
+        async with engine.begin() as conn:
+            for name in obsolete_indexes:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        logger.info("Dropped obsolete indexes: %s", ", ".join(obsolete_indexes))
 
 
-async def get_db() -> AsyncSession:
+async def get_db() -> AsyncIterator[AsyncSession]:
     """Dependency to get database session."""
     async with AsyncSessionLocal() as session:
         try:
@@ -50,5 +262,3 @@ async def get_db() -> AsyncSession:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
@@ -1,8 +1,10 @@
 """Main FastAPI application entry point."""
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
 from app.database import init_db
@@ -14,8 +16,19 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager - handles startup and shutdown."""
     # Startup: Initialize database
     await init_db()
+    background_tasks = [
+        asyncio.create_task(foods.prune_expired_cache_periodically()),
+        asyncio.create_task(foods.flush_usage_counts_periodically()),
+    ]
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop background work, write any buffered usage counts and
+    # close pooled outbound HTTP connections
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await foods.flush_usage_counts()
+    await foods.off_service.aclose()
 
 
 def create_app() -> FastAPI:
@@ -27,6 +40,7 @@ def create_app() -> FastAPI:
         description="Macro tracking and AI-powered food planning API",
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # CORS middleware
@@ -36,6 +50,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
     
     # Include routers
@@ -1,10 +1,10 @@
 """Food database model."""
 
 from datetime import datetime
-from sqlalchemy import String, Float, DateTime
+from sqlalchemy import String, Float, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Food(Base):
@@ -32,11 +32,30 @@ class Food(Base):
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utcnow(), onupdate=utcnow()
     )
     
     def __repr__(self) -> str:
         return f"<Food(id={self.id}, name='{self.name}')>"
+
+
+
+# Trigram indexes so lower(...) LIKE '%search%' on PostgreSQL avoids a full
+# scan; the indexed expressions match the ones the search query uses
+Index(
+    "ix_foods_name_trgm",
+    func.lower(Food.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+    info={"dialect": "postgresql"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_foods_brand_trgm",
+    func.lower(Food.brand).label("brand_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"brand_lower": "gin_trgm_ops"},
+    info={"dialect": "postgresql"},
+).ddl_if(dialect="postgresql")
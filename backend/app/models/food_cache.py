@@ -1,10 +1,10 @@
 """Food search cache database model."""
 
 from datetime import datetime
-from sqlalchemy import String, Float, DateTime, Text, Index, Boolean, Integer
+from sqlalchemy import String, Float, DateTime, Text, Index, Boolean, Integer, desc, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class FoodCache(Base):
@@ -17,8 +17,9 @@ class FoodCache(Base):
     # Unique identifier from Open Food Facts (barcode)
     barcode: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
     
-    # Search query that found this food (for cache lookup)
-    search_query: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    # Search queries that found this food (for cache lookup), stored
+    # lowercased and joined with "|"
+    search_query: Mapped[str | None] = mapped_column(String(255), nullable=True)
     
     # Food data
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -39,17 +40,43 @@ class FoodCache(Base):
     nova_group: Mapped[int | None] = mapped_column(nullable=True)
     
     # User-specific flags
-    is_saved: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    is_saved: Mapped[bool] = mapped_column(Boolean, default=False)
     usage_count: Mapped[int] = mapped_column(Integer, default=0)
     
     # Cache metadata
-    cached_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    cached_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow())
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     
     # Index for efficient cache lookups
     __table_args__ = (
+        # search_query is lowercased on write, so this indexes the lowered value
         Index('ix_food_cache_search_query_lower', 'search_query'),
+        # Matches the cached foods listing order (saved, most used, name)
+        Index(
+            'ix_food_cache_saved_usage_name',
+            desc('is_saved'),
+            desc('usage_count'),
+            'name',
+        ),
     )
     
     def __repr__(self) -> str:
         return f"<FoodCache(barcode='{self.barcode}', name='{self.name}', saved={self.is_saved})>"
+
+
+# Trigram indexes so lower(...) LIKE '%search%' on PostgreSQL avoids a full
+# scan; the indexed expressions match the ones the search queries use
+Index(
+    "ix_food_cache_name_trgm",
+    func.lower(FoodCache.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+    info={"dialect": "postgresql"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_food_cache_brand_trgm",
+    func.lower(FoodCache.brand).label("brand_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"brand_lower": "gin_trgm_ops"},
+    info={"dialect": "postgresql"},
+).ddl_if(dialect="postgresql")
@@ -1,10 +1,11 @@
 """Goal/target database model."""
 
 from datetime import datetime
-from sqlalchemy import Float, DateTime, Text, Boolean
+from sqlalchemy import Float, DateTime, Text, Boolean, Index, Row, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Goal(Base):
@@ -28,11 +29,35 @@ class Goal(Base):
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utcnow(), onupdate=utcnow()
+    )
+    
+    # Partial index covering only the active goal, newest first
+    __table_args__ = (
+        Index(
+            "ix_goals_active_created_at",
+            "created_at",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
     )
     
     def __repr__(self) -> str:
         return f"<Goal(id={self.id}, calories={self.daily_calories}, active={self.is_active})>"
+    
+    @classmethod
+    async def get_active_targets(cls, session: AsyncSession) -> Row | None:
+        """Fetch the active goal's daily targets as a plain row.
+        
+        Callers that only read the four targets skip building an ORM object.
+        """
+        result = await session.execute(
+            select(cls.daily_calories, cls.daily_protein, cls.daily_carbs, cls.daily_fat)
+            .where(cls.is_active == True)
+            .order_by(cls.created_at.desc())
+            .limit(1)
+        )
+        return result.first()
@@ -1,10 +1,10 @@
 """Meal tracking database models."""
 
 from datetime import date, datetime
-from sqlalchemy import String, Float, Date, DateTime, ForeignKey, Text, Integer
+from sqlalchemy import String, Float, Date, DateTime, ForeignKey, Text, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Meal(Base):
@@ -13,7 +13,7 @@ class Meal(Base):
     __tablename__ = "meals"
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
     meal_type: Mapped[str] = mapped_column(String(50), nullable=False)  # breakfast, lunch, dinner, snack
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     
@@ -28,12 +28,17 @@ class Meal(Base):
         "MealEntry",
         back_populates="meal",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
     )
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
+    )
+    
+    # One meal per date and type; also serves date-only lookups
+    __table_args__ = (
+        Index("ux_meals_date_meal_type", "date", "meal_type", unique=True),
     )
     
     def __repr__(self) -> str:
@@ -46,11 +51,11 @@ class MealEntry(Base):
     __tablename__ = "meal_entries"
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    meal_id: Mapped[int] = mapped_column(ForeignKey("meals.id"), nullable=False)
+    meal_id: Mapped[int] = mapped_column(ForeignKey("meals.id"), nullable=False, index=True)
     
     # Can reference a saved food, recipe, or be custom
-    food_id: Mapped[int | None] = mapped_column(ForeignKey("foods.id"), nullable=True)
-    recipe_id: Mapped[int | None] = mapped_column(ForeignKey("recipes.id"), nullable=True)
+    food_id: Mapped[int | None] = mapped_column(ForeignKey("foods.id"), nullable=True, index=True)
+    recipe_id: Mapped[int | None] = mapped_column(ForeignKey("recipes.id"), nullable=True, index=True)
     food_name: Mapped[str] = mapped_column(String(255), nullable=False)
     
     # Amount consumed
@@ -68,7 +73,7 @@ class MealEntry(Base):
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     
     def __repr__(self) -> str:
@@ -2,9 +2,13 @@
 
 from datetime import datetime
 from sqlalchemy import Integer, Text, DateTime, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, utcnow
+
+# Stored as binary JSONB on PostgreSQL (no reparse on read); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 
 class UserPreferences(Base):
@@ -15,13 +19,13 @@ class UserPreferences(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     
     # Food preferences (stored as JSON arrays)
-    liked_foods: Mapped[list | None] = mapped_column(JSON, nullable=True, default=list)
-    disliked_foods: Mapped[list | None] = mapped_column(JSON, nullable=True, default=list)
-    allergies: Mapped[list | None] = mapped_column(JSON, nullable=True, default=list)
+    liked_foods: Mapped[list | None] = mapped_column(JSONType, nullable=True, default=list)
+    disliked_foods: Mapped[list | None] = mapped_column(JSONType, nullable=True, default=list)
+    allergies: Mapped[list | None] = mapped_column(JSONType, nullable=True, default=list)
     
     # Dietary restrictions (stored as JSON object with boolean flags)
     # e.g., {"vegan": true, "vegetarian": false, "gluten_free": true}
-    dietary_restrictions: Mapped[dict | None] = mapped_column(JSON, nullable=True, default=dict)
+    dietary_restrictions: Mapped[dict | None] = mapped_column(JSONType, nullable=True, default=dict)
     
     # Budget preference: "low", "medium", "high"
     budget_preference: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -34,10 +38,10 @@ class UserPreferences(Base):
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utcnow(), onupdate=utcnow()
     )
     
     def __repr__(self) -> str:
@@ -1,10 +1,10 @@
 """Recipe database models."""
 
 from datetime import datetime
-from sqlalchemy import String, Float, Text, DateTime, ForeignKey, Integer
+from sqlalchemy import String, Float, Text, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Recipe(Base):
@@ -23,15 +23,27 @@ class Recipe(Base):
         "RecipeIngredient",
         back_populates="recipe",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
     )
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utcnow(), onupdate=utcnow()
+    )
+    
+    # Trigram index so ILIKE '%search%' on PostgreSQL avoids a full scan;
+    # SQLite keeps using the plain name index
+    __table_args__ = (
+        Index(
+            "ix_recipes_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            info={"dialect": "postgresql"},
+        ).ddl_if(dialect="postgresql"),
     )
     
     @property
@@ -84,7 +96,7 @@ class RecipeIngredient(Base):
     __tablename__ = "recipe_ingredients"
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    recipe_id: Mapped[int] = mapped_column(ForeignKey("recipes.id"), nullable=False)
+    recipe_id: Mapped[int] = mapped_column(ForeignKey("recipes.id"), nullable=False, index=True)
     
     # Can reference a saved food or be a custom entry
     food_id: Mapped[int | None] = mapped_column(ForeignKey("foods.id"), nullable=True)
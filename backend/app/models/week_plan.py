@@ -1,11 +1,12 @@
 """Week plan database models."""
 
 from datetime import date, datetime
-from sqlalchemy import String, Float, Date, DateTime, ForeignKey, Text, Integer, Enum
+from sqlalchemy import String, Float, Date, DateTime, ForeignKey, Text, Integer, Enum, Index, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class WeekPlanStatus(str, enum.Enum):
@@ -26,7 +27,6 @@ class WeekPlan(Base):
     status: Mapped[str] = mapped_column(
         String(20), 
         default=WeekPlanStatus.DRAFT.value,
-        index=True
     )
     
     # Optional notes
@@ -43,15 +43,20 @@ class WeekPlan(Base):
         "WeekPlanMeal",
         back_populates="week_plan",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
     )
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=utcnow(), onupdate=utcnow()
+    )
+    
+    # Status filter plus most-recently-updated ordering (list and draft lookup)
+    __table_args__ = (
+        Index("ix_week_plans_status_updated_at", "status", "updated_at"),
     )
     
     def __repr__(self) -> str:
@@ -63,6 +68,31 @@ class WeekPlan(Base):
         self.total_protein = sum(m.protein for m in self.meals)
         self.total_carbs = sum(m.carbs for m in self.meals)
         self.total_fat = sum(m.fat for m in self.meals)
+    
+    @classmethod
+    async def recompute_totals(cls, session: AsyncSession, plan_id: int) -> None:
+        """Recalculate a plan's total macros in the database.
+        
+        Sums the plan's meals in a single UPDATE, so the meals do not have to
+        be loaded.
+        """
+        def meal_sum(column):
+            return (
+                select(func.coalesce(func.sum(column), 0))
+                .where(WeekPlanMeal.week_plan_id == plan_id)
+                .scalar_subquery()
+            )
+        
+        await session.execute(
+            update(cls)
+            .where(cls.id == plan_id)
+            .values(
+                total_calories=meal_sum(WeekPlanMeal.calories),
+                total_protein=meal_sum(WeekPlanMeal.protein),
+                total_carbs=meal_sum(WeekPlanMeal.carbs),
+                total_fat=meal_sum(WeekPlanMeal.fat),
+            )
+        )
 
 
 class WeekPlanMeal(Base):
@@ -103,7 +133,7 @@ class WeekPlanMeal(Base):
     
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow
+        DateTime, default=utcnow()
     )
     
     def __repr__(self) -> str:
@@ -1,113 +1,142 @@
 """AI-powered features API endpoints."""
 
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.database import get_db
-from app.models.goal import Goal
-from app.models.preferences import UserPreferences
 from app.schemas.ai import (
     MealPlanRequest, MealPlanResponse,
     RecipeSuggestionRequest, RecipeSuggestionResponse,
     ChatRequest, ChatResponse
 )
 from app.services.gemini import GeminiService
+from app.services.user_context import get_active_goal_targets, get_latest_preferences
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 gemini_service = GeminiService()
 
+# Dietary flags from user preferences and the prompt text each one adds
+DIET_RESTRICTIONS = (
+    ("vegan", "Vegan (no animal products)"),
+    ("vegetarian", "Vegetarian (no meat)"),
+    ("pescatarian", "Pescatarian (fish ok, no other meat)"),
+    ("gluten_free", "Gluten-free"),
+    ("dairy_free", "Dairy-free"),
+    ("nut_free", "Nut-free"),
+    ("halal", "Halal"),
+    ("kosher", "Kosher"),
+)
+DIET_PREFERENCES = (
+    ("low_carb", "Low carb diet"),
+    ("keto", "Keto diet (very low carb, high fat)"),
+)
+BUDGET_PREFERENCES = {
+    "low": "Budget-friendly, affordable ingredients",
+    "medium": "Moderate budget, balance of quality and cost",
+    "high": "Premium ingredients, no budget constraints"
+}
 
-@router.post("/meal-plan", response_model=MealPlanResponse)
-async def generate_meal_plan(
-    request: MealPlanRequest,
-    db: AsyncSession = Depends(get_db),
-):
-    """Generate a weekly meal plan based on goals, preferences, and user settings."""
+
+async def _meal_plan_arguments(request: MealPlanRequest, db: AsyncSession) -> dict[str, Any]:
+    """Combine the request with the current goal and user preferences."""
     # Get current goal if not provided in request
     goal = None
     if request.use_current_goal:
-        result = await db.execute(
-            select(Goal).where(Goal.is_active == True)
-        )
-        goal = result.scalar_one_or_none()
+        goal = await get_active_goal_targets(db)
     
     # Get user preferences
-    pref_result = await db.execute(
-        select(UserPreferences).order_by(UserPreferences.id.desc()).limit(1)
-    )
-    user_prefs = pref_result.scalar_one_or_none()
+    user_prefs = await get_latest_preferences(db)
     
     # Combine request preferences with user preferences
-    preferences = list(request.preferences or [])
-    restrictions = list(request.restrictions or [])
+    preferences = list(request.preferences) if request.preferences else []
+    restrictions = list(request.restrictions) if request.restrictions else []
     
     if user_prefs:
         # Add liked foods as preferences
         if user_prefs.liked_foods:
-            preferences.extend([f"Include: {food}" for food in user_prefs.liked_foods])
+            preferences.extend(f"Include: {food}" for food in user_prefs.liked_foods)
         
         # Add disliked foods as restrictions
         if user_prefs.disliked_foods:
-            restrictions.extend([f"Avoid: {food}" for food in user_prefs.disliked_foods])
+            restrictions.extend(f"Avoid: {food}" for food in user_prefs.disliked_foods)
         
         # Add allergies as strict restrictions
         if user_prefs.allergies:
-            restrictions.extend([f"ALLERGY - must avoid: {allergy}" for allergy in user_prefs.allergies])
+            restrictions.extend(f"ALLERGY - must avoid: {allergy}" for allergy in user_prefs.allergies)
         
         # Add dietary restrictions
         if user_prefs.dietary_restrictions:
             diet_prefs = user_prefs.dietary_restrictions
-            if diet_prefs.get("vegan"):
-                restrictions.append("Vegan (no animal products)")
-            if diet_prefs.get("vegetarian"):
-                restrictions.append("Vegetarian (no meat)")
-            if diet_prefs.get("pescatarian"):
-                restrictions.append("Pescatarian (fish ok, no other meat)")
-            if diet_prefs.get("gluten_free"):
-                restrictions.append("Gluten-free")
-            if diet_prefs.get("dairy_free"):
-                restrictions.append("Dairy-free")
-            if diet_prefs.get("nut_free"):
-                restrictions.append("Nut-free")
-            if diet_prefs.get("halal"):
-                restrictions.append("Halal")
-            if diet_prefs.get("kosher"):
-                restrictions.append("Kosher")
-            if diet_prefs.get("low_carb"):
-                preferences.append("Low carb diet")
-            if diet_prefs.get("keto"):
-                preferences.append("Keto diet (very low carb, high fat)")
+            restrictions.extend(text for key, text in DIET_RESTRICTIONS if diet_prefs.get(key))
+            preferences.extend(text for key, text in DIET_PREFERENCES if diet_prefs.get(key))
         
         # Add budget preference
         if user_prefs.budget_preference:
-            budget_map = {
-                "low": "Budget-friendly, affordable ingredients",
-                "medium": "Moderate budget, balance of quality and cost",
-                "high": "Premium ingredients, no budget constraints"
-            }
-            preferences.append(budget_map.get(user_prefs.budget_preference, ""))
+            preferences.append(BUDGET_PREFERENCES.get(user_prefs.budget_preference, ""))
         
         # Add cooking time preference
         if user_prefs.max_cooking_time_minutes:
             preferences.append(f"Recipes should take max {user_prefs.max_cooking_time_minutes} minutes to cook")
     
+    return {
+        "calories": request.daily_calories or (goal.daily_calories if goal else 2000),
+        "protein": request.daily_protein or (goal.daily_protein if goal else 150),
+        "carbs": request.daily_carbs or (goal.daily_carbs if goal else 200),
+        "fat": request.daily_fat or (goal.daily_fat if goal else 65),
+        "days": request.days,
+        "preferences": preferences,
+        "restrictions": restrictions,
+        "language": request.language,
+    }
+
+
+@router.post("/meal-plan", response_model=MealPlanResponse)
+async def generate_meal_plan(
+    request: MealPlanRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Generate a weekly meal plan based on goals, preferences, and user settings."""
+    arguments = await _meal_plan_arguments(request, db)
     try:
-        plan = await gemini_service.generate_meal_plan(
-            calories=request.daily_calories or (goal.daily_calories if goal else 2000),
-            protein=request.daily_protein or (goal.daily_protein if goal else 150),
-            carbs=request.daily_carbs or (goal.daily_carbs if goal else 200),
-            fat=request.daily_fat or (goal.daily_fat if goal else 65),
-            days=request.days,
-            preferences=preferences,
-            restrictions=restrictions,
-            language=request.language,
-        )
+        plan = await gemini_service.generate_meal_plan(**arguments)
         return plan
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI service error: {str(e)}")
 
 
+@router.post("/meal-plan/stream")
+async def stream_meal_plan(
+    request: MealPlanRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream a generated meal plan as server-sent events.
+    
+    Each "data" event carries the next piece of the plan's JSON text as a JSON
+    string; the concatenated text is what /meal-plan parses. A final "done"
+    (or "error") event ends the stream.
+    """
+    arguments = await _meal_plan_arguments(request, db)
+    
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in gemini_service.stream_meal_plan(**arguments):
+                yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield b"event: error\ndata: " + orjson.dumps(f"AI service error: {e}") + b"\n\n"
+            return
+        yield b"event: done\ndata: {}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.post("/suggest-recipes", response_model=RecipeSuggestionResponse)
 async def suggest_recipes(
     request: RecipeSuggestionRequest,
@@ -133,11 +162,7 @@ async def nutrition_chat(
 ):
     """Chat with AI about nutrition and food planning."""
     # Get current goal for context
-    goal = None
-    result = await db.execute(
-        select(Goal).where(Goal.is_active == True)
-    )
-    goal = result.scalar_one_or_none()
+    goal = await get_active_goal_targets(db)
     
     goal_context = None
     if goal:
@@ -157,6 +182,5 @@ async def nutrition_chat(
         )
         return response
     except Exception as e:
-        import logging
-        logging.error(f"AI chat error: {e}", exc_info=True)
+        logger.error("AI chat error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"AI service error: {str(e)}")
@@ -1,87 +1,240 @@
 """Food-related API endpoints."""
 
+import asyncio
+import logging
+from collections import Counter
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
+from sqlalchemy import bindparam, delete, exists, select, update, or_, func
 
-from app.database import get_db
+from app.cache import TTLCache
+from app.database import AsyncSessionLocal, dialect_insert, get_db, utcnow
 from app.models.food import Food
 from app.models.food_cache import FoodCache
+from app.models.week_plan import WeekPlanMeal
 from app.schemas.food import FoodCreate, FoodResponse, FoodSearchResult, FoodCacheResponse, FoodCacheUpdate
 from app.services.openfoodfacts import OpenFoodFactsService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 off_service = OpenFoodFactsService()
 
-# Cache duration: 30 days
-CACHE_DURATION_DAYS = 30
+# Cache duration: a week for foods nobody has used, one more week per use,
+# and the maximum for saved foods, whose data rarely changes
+MIN_CACHE_DURATION_DAYS = 7
+MAX_CACHE_DURATION_DAYS = 180
+
+# How often expired cache entries are deleted
+CACHE_PRUNE_INTERVAL_SECONDS = 60 * 60
+
+# How long a search response is served from memory. User edits to foods and
+# saved foods clear it right away; background cache refreshes and usage counts
+# only affect ordering and freshness, which may lag by up to this long
+SEARCH_RESULTS_CACHE_TTL_SECONDS = 120
+
+# How often buffered usage count increments are written to the database
+USAGE_FLUSH_INTERVAL_SECONDS = 5
+
+# Rows fetched per round trip when streaming listings
+STREAM_BATCH_SIZE = 200
+
+# Only the columns that search results expose; timestamps, cache metadata and
+# usage counters are never read. Labels match FoodSearchResult fields, so rows
+# unpack straight into it
+FOOD_SEARCH_COLUMNS = (
+    Food.barcode, Food.name, Food.brand,
+    Food.calories, Food.protein, Food.carbs, Food.fat,
+    Food.fiber, Food.sugar, Food.sodium,
+)
+FOOD_CACHE_SEARCH_COLUMNS = (
+    FoodCache.barcode, FoodCache.name, FoodCache.brand, FoodCache.image_url,
+    FoodCache.calories, FoodCache.protein, FoodCache.carbs, FoodCache.fat,
+    FoodCache.fiber, FoodCache.sugar, FoodCache.sodium,
+    FoodCache.nutriscore_grade, FoodCache.nova_group,
+)
+
+# Product data copied from search results into the cache
+CACHED_FOOD_FIELDS = {
+    "name", "brand", "image_url",
+    "calories", "protein", "carbs", "fat", "fiber", "sugar", "sodium",
+    "nutriscore_grade", "nova_group",
+}
+
+def cache_duration(usage_count: int, is_saved: bool) -> timedelta:
+    """How long a cached food stays fresh, based on how much it is used."""
+    if is_saved:
+        return timedelta(days=MAX_CACHE_DURATION_DAYS)
+    days = MIN_CACHE_DURATION_DAYS * (1 + usage_count)
+    return timedelta(days=min(days, MAX_CACHE_DURATION_DAYS))
+
+
+# Usage count increments per cached food id not yet written to the database,
+# and those a flush is currently writing
+_pending_usage: Counter[int] = Counter()
+_flushing_usage: Counter[int] = Counter()
+
+# Search responses keyed by (query, page, page_size, local_only)
+_search_results_cache = TTLCache(maxsize=2048, ttl=SEARCH_RESULTS_CACHE_TTL_SECONDS)
+
+
+def invalidate_search_results() -> None:
+    """Drop cached search responses after the user changed foods or saved foods."""
+    _search_results_cache.clear()
 
 
 async def cache_food_results(
-    db: AsyncSession,
     results: list[FoodSearchResult],
     search_query: str,
     max_cache: int = 10,
 ) -> None:
-    """Cache top N food search results in the database."""
-    expires_at = datetime.utcnow() + timedelta(days=CACHE_DURATION_DAYS)
+    """Cache top N food search results in the database.
     
-    for food in results[:max_cache]:
-        if not food.barcode:
-            continue
+    Runs as a background task after the search response is sent, so it opens
+    its own session instead of using the request-scoped one.
+    """
+    now = datetime.utcnow()
+    query_lower = search_query.lower()
+    # One row per barcode; a later duplicate in the results wins
+    to_cache = {food.barcode: food for food in results[:max_cache] if food.barcode}
+    if not to_cache:
+        return
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            # Entries already cached for these barcodes, in one query
+            existing = await db.execute(
+                select(
+                    FoodCache.barcode,
+                    FoodCache.search_query,
+                    FoodCache.usage_count,
+                    FoodCache.is_saved,
+                ).where(FoodCache.barcode.in_(to_cache))
+            )
+            known_entries = {row.barcode: row for row in existing}
             
-        # Check if already cached
-        existing = await db.execute(
-            select(FoodCache).where(FoodCache.barcode == food.barcode)
+            rows = []
+            for barcode, food in to_cache.items():
+                known_entry = known_entries.get(barcode)
+                known = known_entry.search_query if known_entry else None
+                
+                # Add search query if not already associated
+                if known and query_lower not in known.lower():
+                    merged_query = f"{known}|{query_lower}"
+                else:
+                    merged_query = known or query_lower
+                
+                if known_entry:
+                    expires_at = now + cache_duration(known_entry.usage_count, known_entry.is_saved)
+                else:
+                    expires_at = now + cache_duration(0, False)
+                rows.append({
+                    **food.model_dump(include=CACHED_FOOD_FIELDS),
+                    "barcode": barcode,
+                    "search_query": merged_query,
+                    "expires_at": expires_at,
+                })
+            
+            # Insert new entries and refresh existing ones in a single statement,
+            # preserving is_saved and usage_count
+            stmt = dialect_insert(FoodCache).values(rows)
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[FoodCache.barcode],
+                    set_={
+                        **{field: stmt.excluded[field] for field in CACHED_FOOD_FIELDS},
+                        "search_query": stmt.excluded.search_query,
+                        "expires_at": stmt.excluded.expires_at,
+                        "cached_at": utcnow(),
+                    },
+                )
+            )
+            await db.commit()
+    except Exception:
+        logger.exception("Caching food search results failed")
+
+
+async def prune_expired_cache() -> int:
+    """Delete expired cache entries in one statement.
+    
+    Saved entries and entries a week plan refers to are kept; for the rest,
+    expires_at (which cache_duration extends with usage) decides.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(FoodCache).where(
+                FoodCache.expires_at < datetime.utcnow(),
+                FoodCache.is_saved == False,
+                # Just used, with the use not written yet
+                FoodCache.id.not_in([*_pending_usage, *_flushing_usage]),
+                ~exists().where(WeekPlanMeal.food_cache_id == FoodCache.id),
+            )
         )
-        cached_food = existing.scalar_one_or_none()
-        
-        if cached_food:
-            # Update existing cache entry (but preserve is_saved and usage_count)
-            cached_food.name = food.name
-            cached_food.brand = food.brand
-            cached_food.image_url = food.image_url
-            cached_food.calories = food.calories
-            cached_food.protein = food.protein
-            cached_food.carbs = food.carbs
-            cached_food.fat = food.fat
-            cached_food.fiber = food.fiber
-            cached_food.sugar = food.sugar
-            cached_food.sodium = food.sodium
-            cached_food.nutriscore_grade = food.nutriscore_grade
-            cached_food.nova_group = food.nova_group
-            cached_food.cached_at = datetime.utcnow()
-            cached_food.expires_at = expires_at
-            # Add search query if not already associated
-            if cached_food.search_query and search_query.lower() not in cached_food.search_query.lower():
-                cached_food.search_query = f"{cached_food.search_query}|{search_query.lower()}"
-            elif not cached_food.search_query:
-                cached_food.search_query = search_query.lower()
-        else:
-            # Create new cache entry
-            new_cache = FoodCache(
-                barcode=food.barcode,
-                search_query=search_query.lower(),
-                name=food.name,
-                brand=food.brand,
-                image_url=food.image_url,
-                calories=food.calories,
-                protein=food.protein,
-                carbs=food.carbs,
-                fat=food.fat,
-                fiber=food.fiber,
-                sugar=food.sugar,
-                sodium=food.sodium,
-                nutriscore_grade=food.nutriscore_grade,
-                nova_group=food.nova_group,
-                expires_at=expires_at,
-                is_saved=False,
-                usage_count=0,
+        await db.commit()
+    return result.rowcount
+
+
+async def prune_expired_cache_periodically() -> None:
+    """Prune the food cache on a fixed interval until cancelled."""
+    while True:
+        try:
+            deleted = await prune_expired_cache()
+            if deleted:
+                logger.info("Pruned %d expired food cache entries", deleted)
+        except Exception:
+            logger.exception("Food cache pruning failed")
+        await asyncio.sleep(CACHE_PRUNE_INTERVAL_SECONDS)
+
+
+def _with_pending_usage(cached_food: FoodCache) -> FoodCacheResponse:
+    """Build the response for a cached food, counting uses not yet written."""
+    response = FoodCacheResponse.model_validate(cached_food)
+    response.usage_count += _pending_usage[cached_food.id] + _flushing_usage[cached_food.id]
+    return response
+
+
+async def flush_usage_counts() -> int:
+    """Write buffered usage count increments in one batched UPDATE."""
+    if not _pending_usage:
+        return 0
+    pending = Counter(_pending_usage)
+    _pending_usage.clear()
+    # Still reported in responses until the UPDATE is committed
+    _flushing_usage.update(pending)
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            table = FoodCache.__table__
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("cache_id"))
+                .values(usage_count=table.c.usage_count + bindparam("delta")),
+                [{"cache_id": cache_id, "delta": delta} for cache_id, delta in pending.items()],
             )
-            db.add(new_cache)
-    
-    await db.commit()
+            await db.commit()
+    except Exception:
+        # Keep the increments for the next attempt
+        _pending_usage.update(pending)
+        raise
+    finally:
+        _flushing_usage.subtract(pending)
+        for cache_id in pending:
+            if _flushing_usage[cache_id] <= 0:
+                del _flushing_usage[cache_id]
+    
+    return len(pending)
+
+
+async def flush_usage_counts_periodically() -> None:
+    """Flush buffered usage counts on a fixed interval until cancelled."""
+    while True:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_usage_counts()
+        except Exception:
+            logger.exception("Flushing food usage counts failed")
 
 
 async def search_local_db(
@@ -95,34 +248,21 @@ async def search_local_db(
     
     # Search custom foods
     custom_result = await db.execute(
-        select(Food).where(
+        select(*FOOD_SEARCH_COLUMNS).where(
             or_(
                 func.lower(Food.name).contains(query_lower),
                 func.lower(Food.brand).contains(query_lower),
             )
         ).limit(limit)
     )
-    for food in custom_result.scalars().all():
-        results.append(FoodSearchResult(
-            barcode=food.barcode,
-            name=food.name,
-            brand=food.brand,
-            image_url=None,
-            calories=food.calories,
-            protein=food.protein,
-            carbs=food.carbs,
-            fat=food.fat,
-            fiber=food.fiber,
-            sugar=food.sugar,
-            sodium=food.sodium,
-            nutriscore_grade=None,
-            nova_group=None,
-            source="custom",
-        ))
+    results.extend(
+        FoodSearchResult(**food._mapping, source="custom")
+        for food in custom_result
+    )
     
     # Search saved cached foods
     cache_result = await db.execute(
-        select(FoodCache).where(
+        select(*FOOD_CACHE_SEARCH_COLUMNS).where(
             FoodCache.is_saved == True,
             or_(
                 func.lower(FoodCache.name).contains(query_lower),
@@ -131,23 +271,10 @@ async def search_local_db(
             )
         ).order_by(FoodCache.usage_count.desc()).limit(limit)
     )
-    for food in cache_result.scalars().all():
-        results.append(FoodSearchResult(
-            barcode=food.barcode,
-            name=food.name,
-            brand=food.brand,
-            image_url=food.image_url,
-            calories=food.calories,
-            protein=food.protein,
-            carbs=food.carbs,
-            fat=food.fat,
-            fiber=food.fiber,
-            sugar=food.sugar,
-            sodium=food.sodium,
-            nutriscore_grade=food.nutriscore_grade,
-            nova_group=food.nova_group,
-            source="cached",
-        ))
+    results.extend(
+        FoodSearchResult(**food._mapping, source="cached")
+        for food in cache_result
+    )
     
     return results
 
@@ -162,43 +289,27 @@ async def get_cached_results(
     
     # Search for cached results that match the query
     result = await db.execute(
-        select(FoodCache).where(
+        select(*FOOD_CACHE_SEARCH_COLUMNS).where(
             or_(
-                FoodCache.search_query.ilike(f"%{query_lower}%"),
+                # Stored lowercased, so a plain LIKE avoids ILIKE's per-row lower()
+                FoodCache.search_query.contains(query_lower),
                 func.lower(FoodCache.name).contains(query_lower),
                 func.lower(FoodCache.brand).contains(query_lower),
             ),
             FoodCache.expires_at > now,
         ).order_by(FoodCache.usage_count.desc()).limit(50)
     )
-    cached_foods = result.scalars().all()
+    cached_foods = result.all()
     
     if not cached_foods:
         return None
     
-    return [
-        FoodSearchResult(
-            barcode=f.barcode,
-            name=f.name,
-            brand=f.brand,
-            image_url=f.image_url,
-            calories=f.calories,
-            protein=f.protein,
-            carbs=f.carbs,
-            fat=f.fat,
-            fiber=f.fiber,
-            sugar=f.sugar,
-            sodium=f.sodium,
-            nutriscore_grade=f.nutriscore_grade,
-            nova_group=f.nova_group,
-            source="cached",
-        )
-        for f in cached_foods
-    ]
+    return [FoodSearchResult(**f._mapping, source="cached") for f in cached_foods]
 
 
 @router.get("/search", response_model=list[FoodSearchResult])
 async def search_foods(
+    background_tasks: BackgroundTasks,
     query: str = Query(..., min_length=2, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Results per page"),
@@ -207,8 +318,46 @@ async def search_foods(
     db: AsyncSession = Depends(get_db),
 ):
     """Search for foods - local database first, then Open Food Facts."""
+    # Popular searches repeat often, so answer them from memory when possible
+    cache_key = (query.lower(), page, page_size, local_only)
+    if not force_refresh:
+        cached = _search_results_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    results = await _search_foods(
+        db, background_tasks, query, page, page_size, force_refresh, local_only
+    )
+    if results:
+        _search_results_cache.set(cache_key, results)
+    return results
+
+
+async def _search_foods(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    query: str,
+    page: int,
+    page_size: int,
+    force_refresh: bool,
+    local_only: bool,
+) -> list[FoodSearchResult]:
+    """Run a food search against the database and Open Food Facts."""
+    # Without a cache check, Open Food Facts is always queried, so overlap the
+    # request with the local search instead of waiting for it
+    api_task = None
+    if not local_only and (page > 1 or force_refresh):
+        api_task = asyncio.create_task(
+            off_service.search_products(query, page, page_size, use_cache=not force_refresh)
+        )
+    
     # Always search local database first
-    local_results = await search_local_db(db, query, limit=page_size)
+    try:
+        local_results = await search_local_db(db, query, limit=page_size)
+    except BaseException:
+        if api_task:
+            api_task.cancel()
+        raise
     
     # If local_only is requested, return local results
     if local_only:
@@ -232,15 +381,20 @@ async def search_foods(
                 return local_results[:page_size]
     
     # Fetch from Open Food Facts API if we need more results
-    api_results = await off_service.search_products(query, page, page_size)
+    if api_task:
+        api_results = await api_task
+    else:
+        api_results = await off_service.search_products(
+            query, page, page_size, use_cache=not force_refresh
+        )
     
     # Mark API results with source
     for result in api_results:
         result.source = "openfoodfacts"
     
-    # Cache results
+    # Cache results once the response has been sent
     if api_results:
-        await cache_food_results(db, api_results, query)
+        background_tasks.add_task(cache_food_results, api_results, query)
     
     # Merge results, local first
     seen_barcodes = {r.barcode for r in local_results if r.barcode}
@@ -264,27 +418,12 @@ async def get_food_by_barcode(
     """Get food information by barcode - check local cache first, then Open Food Facts."""
     # Check local cache first
     cache_result = await db.execute(
-        select(FoodCache).where(FoodCache.barcode == barcode)
+        select(*FOOD_CACHE_SEARCH_COLUMNS).where(FoodCache.barcode == barcode)
     )
-    cached_food = cache_result.scalar_one_or_none()
+    cached_food = cache_result.one_or_none()
     
     if cached_food:
-        return FoodSearchResult(
-            barcode=cached_food.barcode,
-            name=cached_food.name,
-            brand=cached_food.brand,
-            image_url=cached_food.image_url,
-            calories=cached_food.calories,
-            protein=cached_food.protein,
-            carbs=cached_food.carbs,
-            fat=cached_food.fat,
-            fiber=cached_food.fiber,
-            sugar=cached_food.sugar,
-            sodium=cached_food.sodium,
-            nutriscore_grade=cached_food.nutriscore_grade,
-            nova_group=cached_food.nova_group,
-            source="cached",
-        )
+        return FoodSearchResult(**cached_food._mapping, source="cached")
     
     # Fetch from Open Food Facts API
     result = await off_service.get_product_by_barcode(barcode)
@@ -292,7 +431,7 @@ async def get_food_by_barcode(
         raise HTTPException(status_code=404, detail="Product not found")
     
     # Cache the result
-    expires_at = datetime.utcnow() + timedelta(days=CACHE_DURATION_DAYS)
+    expires_at = datetime.utcnow() + cache_duration(0, False)
     new_cache = FoodCache(
         barcode=result.barcode,
         search_query=None,
@@ -332,46 +471,74 @@ async def get_saved_foods(
     return result.scalars().all()
 
 
-@router.get("/cached", response_model=list[FoodCacheResponse])
-async def get_cached_foods(
-    db: AsyncSession = Depends(get_db),
-    saved_only: bool = Query(False, description="Only return saved foods"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=500),
-):
-    """Get all cached foods from database."""
+def _cached_foods_query(saved_only: bool):
+    """Build the cached foods listing query (saved and most used first)."""
     query = select(FoodCache)
     
     if saved_only:
         query = query.where(FoodCache.is_saved == True)
     
-    query = query.order_by(
+    return query.order_by(
         FoodCache.is_saved.desc(),
         FoodCache.usage_count.desc(),
         FoodCache.name
-    ).offset(skip).limit(limit)
+    )
+
+
+@router.get("/cached", response_model=list[FoodCacheResponse])
+async def get_cached_foods(
+    db: AsyncSession = Depends(get_db),
+    saved_only: bool = Query(False, description="Only return saved foods"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+):
+    """Get all cached foods from database."""
+    query = _cached_foods_query(saved_only).offset(skip).limit(limit)
     
     result = await db.execute(query)
     return result.scalars().all()
 
 
+@router.get("/cached/stream")
+async def stream_cached_foods(
+    saved_only: bool = Query(False, description="Only return saved foods"),
+    skip: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, description="Maximum number of foods (default: all)"),
+):
+    """Stream cached foods as newline-delimited JSON.
+    
+    Rows are fetched in batches and written as they arrive, so memory use
+    stays flat for large listings.
+    """
+    query = _cached_foods_query(saved_only).offset(skip).limit(limit)
+    
+    async def generate():
+        # The request-scoped session is closed before a streaming body is
+        # sent, so the stream owns its session
+        async with AsyncSessionLocal() as session:
+            foods = await session.stream_scalars(
+                query.execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            async for food in foods:
+                yield FoodCacheResponse.model_validate(food).model_dump_json() + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.put("/cached/{cache_id}/save", response_model=FoodCacheResponse)
 async def toggle_save_cached_food(
     cache_id: int,
     db: AsyncSession = Depends(get_db),
 ):
     """Toggle the saved status of a cached food."""
-    result = await db.execute(
-        select(FoodCache).where(FoodCache.id == cache_id)
-    )
-    cached_food = result.scalar_one_or_none()
+    cached_food = await db.get(FoodCache, cache_id)
     
     if not cached_food:
         raise HTTPException(status_code=404, detail="Cached food not found")
     
     cached_food.is_saved = not cached_food.is_saved
     await db.commit()
-    await db.refresh(cached_food)
+    invalidate_search_results()
     return cached_food
 
 
@@ -382,35 +549,26 @@ async def update_cached_food(
     db: AsyncSession = Depends(get_db),
 ):
     """Update cached food details."""
-    result = await db.execute(
-        select(FoodCache).where(FoodCache.id == cache_id)
-    )
-    cached_food = result.scalar_one_or_none()
+    # Fields left as null keep their current value
+    update_data = food_update.model_dump(exclude_none=True)
+    
+    if update_data:
+        # Update and read back the row in a single statement
+        result = await db.execute(
+            update(FoodCache)
+            .where(FoodCache.id == cache_id)
+            .values(**update_data)
+            .returning(FoodCache)
+        )
+        cached_food = result.scalar_one_or_none()
+    else:
+        cached_food = await db.get(FoodCache, cache_id)
     
     if not cached_food:
         raise HTTPException(status_code=404, detail="Cached food not found")
     
-    if food_update.name is not None:
-        cached_food.name = food_update.name
-    if food_update.brand is not None:
-        cached_food.brand = food_update.brand
-    if food_update.calories is not None:
-        cached_food.calories = food_update.calories
-    if food_update.protein is not None:
-        cached_food.protein = food_update.protein
-    if food_update.carbs is not None:
-        cached_food.carbs = food_update.carbs
-    if food_update.fat is not None:
-        cached_food.fat = food_update.fat
-    if food_update.fiber is not None:
-        cached_food.fiber = food_update.fiber
-    if food_update.sugar is not None:
-        cached_food.sugar = food_update.sugar
-    if food_update.sodium is not None:
-        cached_food.sodium = food_update.sodium
-    
     await db.commit()
-    await db.refresh(cached_food)
+    invalidate_search_results()
     return cached_food
 
 
@@ -429,10 +587,12 @@ async def save_food_by_barcode(
         raise HTTPException(status_code=404, detail="Cached food not found")
     
     cached_food.is_saved = True
-    cached_food.usage_count += 1
     await db.commit()
-    await db.refresh(cached_food)
-    return cached_food
+    invalidate_search_results()
+    
+    # Counted through the same buffer as increment_usage_count
+    _pending_usage[cached_food.id] += 1
+    return _with_pending_usage(cached_food)
 
 
 @router.post("/cached/{cache_id}/increment-usage", response_model=FoodCacheResponse)
@@ -440,19 +600,18 @@ async def increment_usage_count(
     cache_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    """Increment the usage count of a cached food."""
-    result = await db.execute(
-        select(FoodCache).where(FoodCache.id == cache_id)
-    )
-    cached_food = result.scalar_one_or_none()
+    """Increment the usage count of a cached food.
+    
+    The increment is buffered and written in batches; the response already
+    includes it.
+    """
+    cached_food = await db.get(FoodCache, cache_id)
     
     if not cached_food:
         raise HTTPException(status_code=404, detail="Cached food not found")
     
-    cached_food.usage_count += 1
-    await db.commit()
-    await db.refresh(cached_food)
-    return cached_food
+    _pending_usage[cache_id] += 1
+    return _with_pending_usage(cached_food)
 
 
 @router.delete("/cached/{cache_id}")
@@ -461,16 +620,14 @@ async def delete_cached_food(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a cached food entry."""
-    result = await db.execute(
-        select(FoodCache).where(FoodCache.id == cache_id)
-    )
-    cached_food = result.scalar_one_or_none()
+    cached_food = await db.get(FoodCache, cache_id)
     
     if not cached_food:
         raise HTTPException(status_code=404, detail="Cached food not found")
     
     await db.delete(cached_food)
     await db.commit()
+    invalidate_search_results()
     return {"message": "Cached food deleted successfully"}
 
 
@@ -483,7 +640,7 @@ async def create_custom_food(
     db_food = Food(**food.model_dump())
     db.add(db_food)
     await db.commit()
-    await db.refresh(db_food)
+    invalidate_search_results()
     return db_food
 
 
@@ -493,8 +650,7 @@ async def get_food(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific saved food by ID."""
-    result = await db.execute(select(Food).where(Food.id == food_id))
-    food = result.scalar_one_or_none()
+    food = await db.get(Food, food_id)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
     return food
@@ -506,10 +662,10 @@ async def delete_food(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a custom food entry."""
-    result = await db.execute(select(Food).where(Food.id == food_id))
-    food = result.scalar_one_or_none()
+    food = await db.get(Food, food_id)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
     await db.delete(food)
     await db.commit()
+    invalidate_search_results()
     return {"message": "Food deleted successfully"}
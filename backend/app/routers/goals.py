@@ -2,23 +2,27 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.database import get_db
 from app.models.goal import Goal
 from app.schemas.goal import GoalCreate, GoalResponse, GoalUpdate
+from app.services.user_context import invalidate_goal
 
 router = APIRouter()
 
+# Built once so each request reuses the statement and its cached compilation
+CURRENT_GOAL = (
+    select(Goal).where(Goal.is_active == True).order_by(Goal.created_at.desc())
+)
+
 
 @router.get("/", response_model=GoalResponse | None)
 async def get_current_goal(
     db: AsyncSession = Depends(get_db),
 ):
     """Get the current active goal (most recent)."""
-    result = await db.execute(
-        select(Goal).where(Goal.is_active == True).order_by(Goal.created_at.desc())
-    )
+    result = await db.execute(CURRENT_GOAL)
     return result.scalar_one_or_none()
 
 
@@ -37,10 +41,10 @@ async def create_goal(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new goal (deactivates previous goals)."""
-    # Deactivate all existing goals
-    result = await db.execute(select(Goal).where(Goal.is_active == True))
-    for existing_goal in result.scalars():
-        existing_goal.is_active = False
+    # Deactivate all existing goals in one statement
+    await db.execute(
+        update(Goal).where(Goal.is_active == True).values(is_active=False)
+    )
     
     # Create new goal
     db_goal = Goal(
@@ -53,7 +57,7 @@ async def create_goal(
     )
     db.add(db_goal)
     await db.commit()
-    await db.refresh(db_goal)
+    invalidate_goal()
     return db_goal
 
 
@@ -64,24 +68,26 @@ async def update_goal(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing goal."""
-    result = await db.execute(select(Goal).where(Goal.id == goal_id))
-    goal = result.scalar_one_or_none()
+    # Fields left as null keep their current value
+    update_data = goal_update.model_dump(exclude_none=True)
+    
+    if update_data:
+        # Update and read back the row in a single statement
+        result = await db.execute(
+            update(Goal)
+            .where(Goal.id == goal_id)
+            .values(**update_data)
+            .returning(Goal)
+        )
+        goal = result.scalar_one_or_none()
+    else:
+        goal = await db.get(Goal, goal_id)
+    
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     
-    if goal_update.daily_calories is not None:
-        goal.daily_calories = goal_update.daily_calories
-    if goal_update.daily_protein is not None:
-        goal.daily_protein = goal_update.daily_protein
-    if goal_update.daily_carbs is not None:
-        goal.daily_carbs = goal_update.daily_carbs
-    if goal_update.daily_fat is not None:
-        goal.daily_fat = goal_update.daily_fat
-    if goal_update.notes is not None:
-        goal.notes = goal_update.notes
-    
     await db.commit()
-    await db.refresh(goal)
+    invalidate_goal()
     return goal
 
 
@@ -91,10 +97,10 @@ async def delete_goal(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a goal."""
-    result = await db.execute(select(Goal).where(Goal.id == goal_id))
-    goal = result.scalar_one_or_none()
+    goal = await db.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     await db.delete(goal)
     await db.commit()
+    invalidate_goal()
     return {"message": "Goal deleted successfully"}
@@ -3,10 +3,10 @@
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import delete, select, update, and_
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import dialect_insert, get_db
 from app.models.meal import Meal, MealEntry
 from app.schemas.meal import (
     MealCreate, MealResponse, MealEntryCreate, 
@@ -16,17 +16,16 @@ from app.schemas.meal import (
 router = APIRouter()
 
 
-@router.get("/daily/{date_str}", response_model=DailyMealsResponse)
+@router.get(
+    "/daily/{meal_date}",
+    response_model=DailyMealsResponse,
+    response_model_exclude_none=True,
+)
 async def get_daily_meals(
-    date_str: str,
+    meal_date: date,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get all meals for a specific date."""
-    try:
-        meal_date = date.fromisoformat(date_str)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-    
+    """Get all meals for a specific date (YYYY-MM-DD)."""
     result = await db.execute(
         select(Meal)
         .options(selectinload(Meal.entries))
@@ -57,35 +56,23 @@ async def create_meal(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new meal or return existing one (upsert)."""
-    # Check if meal already exists for this date and type
-    result = await db.execute(
-        select(Meal)
-        .options(selectinload(Meal.entries))
-        .where(
-            and_(Meal.date == meal.date, Meal.meal_type == meal.meal_type)
-        )
+    # Insert unless a meal already exists for this date and type; the unique
+    # index turns a concurrent duplicate into a no-op instead of a second row
+    await db.execute(
+        dialect_insert(Meal)
+        .values(date=meal.date, meal_type=meal.meal_type, notes=meal.notes)
+        .on_conflict_do_nothing()
     )
-    existing = result.scalar_one_or_none()
-    if existing:
-        # Return existing meal instead of erroring
-        return existing
-    
-    db_meal = Meal(
-        date=meal.date,
-        meal_type=meal.meal_type,
-        notes=meal.notes,
-    )
-    db.add(db_meal)
     await db.commit()
-    await db.refresh(db_meal)
     
-    # Reload with entries
     result = await db.execute(
         select(Meal)
         .options(selectinload(Meal.entries))
-        .where(Meal.id == db_meal.id)
+        .where(
+            and_(Meal.date == meal.date, Meal.meal_type == meal.meal_type)
+        )
     )
-    return result.scalar_one()
+    return result.scalars().first()
 
 
 @router.get("/{meal_id}", response_model=MealResponse)
@@ -112,10 +99,19 @@ async def add_meal_entry(
     db: AsyncSession = Depends(get_db),
 ):
     """Add a food entry to a meal."""
-    # Verify meal exists
-    result = await db.execute(select(Meal).where(Meal.id == meal_id))
-    meal = result.scalar_one_or_none()
-    if not meal:
+    # Update meal totals in SQL, so concurrent entries cannot overwrite each
+    # other's sums; no matched row means the meal does not exist
+    result = await db.execute(
+        update(Meal)
+        .where(Meal.id == meal_id)
+        .values(
+            total_calories=Meal.total_calories + entry.calories,
+            total_protein=Meal.total_protein + entry.protein,
+            total_carbs=Meal.total_carbs + entry.carbs,
+            total_fat=Meal.total_fat + entry.fat,
+        )
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Meal not found")
     
     db_entry = MealEntry(
@@ -131,15 +127,7 @@ async def add_meal_entry(
         fat=entry.fat,
     )
     db.add(db_entry)
-    
-    # Update meal totals
-    meal.total_calories += entry.calories
-    meal.total_protein += entry.protein
-    meal.total_carbs += entry.carbs
-    meal.total_fat += entry.fat
-    
     await db.commit()
-    await db.refresh(db_entry)
     return db_entry
 
 
@@ -150,24 +138,27 @@ async def remove_meal_entry(
     db: AsyncSession = Depends(get_db),
 ):
     """Remove a food entry from a meal."""
+    # Delete the entry and get back the macros it contributed in one statement
     result = await db.execute(
-        select(MealEntry).where(
-            and_(MealEntry.id == entry_id, MealEntry.meal_id == meal_id)
-        )
+        delete(MealEntry)
+        .where(and_(MealEntry.id == entry_id, MealEntry.meal_id == meal_id))
+        .returning(MealEntry.calories, MealEntry.protein, MealEntry.carbs, MealEntry.fat)
     )
-    entry = result.scalar_one_or_none()
+    entry = result.one_or_none()
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
     # Update meal totals
-    result = await db.execute(select(Meal).where(Meal.id == meal_id))
-    meal = result.scalar_one()
-    meal.total_calories -= entry.calories
-    meal.total_protein -= entry.protein
-    meal.total_carbs -= entry.carbs
-    meal.total_fat -= entry.fat
-    
-    await db.delete(entry)
+    await db.execute(
+        update(Meal)
+        .where(Meal.id == meal_id)
+        .values(
+            total_calories=Meal.total_calories - entry.calories,
+            total_protein=Meal.total_protein - entry.protein,
+            total_carbs=Meal.total_carbs - entry.carbs,
+            total_fat=Meal.total_fat - entry.fat,
+        )
+    )
     await db.commit()
     return {"message": "Entry removed successfully"}
 
@@ -178,7 +169,12 @@ async def delete_meal(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete an entire meal."""
-    result = await db.execute(select(Meal).where(Meal.id == meal_id))
+    # Entries are loaded so the delete-orphan cascade can remove them
+    result = await db.execute(
+        select(Meal)
+        .options(selectinload(Meal.entries))
+        .where(Meal.id == meal_id)
+    )
     meal = result.scalar_one_or_none()
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from app.database import get_db
 from app.models.preferences import UserPreferences
 from app.schemas.preferences import PreferencesResponse, PreferencesUpdate, DietaryRestrictions
+from app.services.user_context import invalidate_preferences
 
 router = APIRouter()
 
@@ -70,5 +71,5 @@ async def update_preferences(
             preferences.notes = preferences_update.notes
     
     await db.commit()
-    await db.refresh(preferences)
+    invalidate_preferences()
     return preferences
@@ -1,8 +1,10 @@
 """Recipe-related API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, tuple_
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
@@ -11,23 +13,61 @@ from app.schemas.recipe import RecipeCreate, RecipeResponse, RecipeUpdate
 
 router = APIRouter()
 
+# Statements are built once at import; SQLAlchemy then reuses their
+# compiled form from its statement cache
+RECIPES_WITH_INGREDIENTS = select(Recipe).options(selectinload(Recipe.ingredients))
+RECIPE_BY_ID = RECIPES_WITH_INGREDIENTS.where(Recipe.id == bindparam("recipe_id"))
+
+
+def _encode_cursor(recipe: Recipe) -> str:
+    """Encode the sort key of the last recipe on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([recipe.name, recipe.id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        name, recipe_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(name), int(recipe_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
 @router.get("/", response_model=list[RecipeResponse])
 async def get_recipes(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     search: str = Query(None, description="Search by name"),
+    cursor: str | None = Query(
+        None, description="Continue after a previous page (X-Next-Cursor header); replaces skip"
+    ),
 ):
-    """Get all recipes with optional search."""
-    query = select(Recipe).options(selectinload(Recipe.ingredients))
+    """Get all recipes with optional search.
+    
+    When a full page is returned, the X-Next-Cursor response header holds a
+    cursor for the next page. Cursor pages seek past the last (name, id)
+    instead of scanning and discarding skipped rows.
+    """
+    query = RECIPES_WITH_INGREDIENTS
     
     if search:
         query = query.where(Recipe.name.ilike(f"%{search}%"))
     
-    query = query.offset(skip).limit(limit).order_by(Recipe.name)
+    if cursor:
+        last_name, last_id = _decode_cursor(cursor)
+        query = query.where(tuple_(Recipe.name, Recipe.id) > tuple_(last_name, last_id))
+    else:
+        query = query.offset(skip)
+    
+    query = query.order_by(Recipe.name, Recipe.id).limit(limit)
     result = await db.execute(query)
-    return result.scalars().all()
+    recipes = result.scalars().all()
+    
+    if len(recipes) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(recipes[-1])
+    return recipes
 
 
 @router.post("/", response_model=RecipeResponse)
@@ -43,13 +83,11 @@ async def create_recipe(
         servings=recipe.servings,
         instructions=recipe.instructions,
     )
-    db.add(db_recipe)
-    await db.flush()  # Get the ID
     
-    # Add ingredients
-    for ing in recipe.ingredients:
-        db_ingredient = RecipeIngredient(
-            recipe_id=db_recipe.id,
+    # Add ingredients through the relationship so the response can be built
+    # from the in-memory state without reloading the recipe
+    db_recipe.ingredients = [
+        RecipeIngredient(
             food_id=ing.food_id,
             food_name=ing.food_name,
             amount=ing.amount,
@@ -59,17 +97,11 @@ async def create_recipe(
             carbs=ing.carbs,
             fat=ing.fat,
         )
-        db.add(db_ingredient)
-    
+        for ing in recipe.ingredients
+    ]
+    db.add(db_recipe)
     await db.commit()
-    
-    # Reload with ingredients
-    result = await db.execute(
-        select(Recipe)
-        .options(selectinload(Recipe.ingredients))
-        .where(Recipe.id == db_recipe.id)
-    )
-    return result.scalar_one()
+    return db_recipe
 
 
 @router.get("/{recipe_id}", response_model=RecipeResponse)
@@ -78,11 +110,7 @@ async def get_recipe(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific recipe by ID."""
-    result = await db.execute(
-        select(Recipe)
-        .options(selectinload(Recipe.ingredients))
-        .where(Recipe.id == recipe_id)
-    )
+    result = await db.execute(RECIPE_BY_ID, {"recipe_id": recipe_id})
     recipe = result.scalar_one_or_none()
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -96,11 +124,7 @@ async def update_recipe(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing recipe."""
-    result = await db.execute(
-        select(Recipe)
-        .options(selectinload(Recipe.ingredients))
-        .where(Recipe.id == recipe_id)
-    )
+    result = await db.execute(RECIPE_BY_ID, {"recipe_id": recipe_id})
     recipe = result.scalar_one_or_none()
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -115,16 +139,10 @@ async def update_recipe(
     if recipe_update.instructions is not None:
         recipe.instructions = recipe_update.instructions
     
-    # Update ingredients if provided
+    # Replace ingredients if provided; delete-orphan removes the old rows
     if recipe_update.ingredients is not None:
-        # Remove old ingredients
-        for ing in recipe.ingredients:
-            await db.delete(ing)
-        
-        # Add new ingredients
-        for ing in recipe_update.ingredients:
-            db_ingredient = RecipeIngredient(
-                recipe_id=recipe.id,
+        recipe.ingredients = [
+            RecipeIngredient(
                 food_id=ing.food_id,
                 food_name=ing.food_name,
                 amount=ing.amount,
@@ -134,17 +152,11 @@ async def update_recipe(
                 carbs=ing.carbs,
                 fat=ing.fat,
             )
-            db.add(db_ingredient)
+            for ing in recipe_update.ingredients
+        ]
     
     await db.commit()
-    
-    # Reload with ingredients
-    result = await db.execute(
-        select(Recipe)
-        .options(selectinload(Recipe.ingredients))
-        .where(Recipe.id == recipe.id)
-    )
-    return result.scalar_one()
+    return recipe
 
 
 @router.delete("/{recipe_id}")
@@ -153,7 +165,8 @@ async def delete_recipe(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a recipe."""
-    result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
+    # Ingredients are loaded so the delete-orphan cascade can remove them
+    result = await db.execute(RECIPE_BY_ID, {"recipe_id": recipe_id})
     recipe = result.scalar_one_or_none()
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -3,13 +3,13 @@
 from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from collections import defaultdict
+from sqlalchemy import bindparam, delete, select, update, func
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import dialect_insert, get_db
 from app.models.week_plan import WeekPlan, WeekPlanMeal, WeekPlanStatus
 from app.models.meal import Meal, MealEntry
-from app.models.goal import Goal
-from app.models.preferences import UserPreferences
 from app.schemas.week_plan import (
     WeekPlanCreate, 
     WeekPlanUpdate, 
@@ -22,9 +22,13 @@ from app.schemas.week_plan import (
     RegenerateDayRequest,
 )
 from app.services.gemini import GeminiService
+from app.services.user_context import get_active_goal_targets, get_latest_preferences
 
 router = APIRouter()
 
+# Plans whose meals are serialized or walked; other queries leave them unloaded
+PLAN_WITH_MEALS = select(WeekPlan).options(selectinload(WeekPlan.meals))
+
 
 @router.get("/", response_model=list[WeekPlanSummary])
 async def get_week_plans(
@@ -34,43 +38,48 @@ async def get_week_plans(
     limit: int = Query(50, ge=1, le=100),
 ):
     """Get all week plans."""
-    query = select(WeekPlan)
+    # Summaries only need the number of meals, so count them in SQL instead
+    # of loading every meal of every plan
+    meal_count = (
+        select(func.count(WeekPlanMeal.id))
+        .where(WeekPlanMeal.week_plan_id == WeekPlan.id)
+        .scalar_subquery()
+    )
+    query = select(
+        WeekPlan.id,
+        WeekPlan.name,
+        WeekPlan.start_date,
+        WeekPlan.status,
+        WeekPlan.total_calories,
+        WeekPlan.total_protein,
+        WeekPlan.total_carbs,
+        WeekPlan.total_fat,
+        meal_count.label("meal_count"),
+        WeekPlan.created_at,
+        WeekPlan.updated_at,
+    )
     
     if status:
         query = query.where(WeekPlan.status == status)
     
     query = query.order_by(WeekPlan.updated_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
-    plans = result.scalars().all()
-    
-    # Add meal count to summaries
-    summaries = []
-    for plan in plans:
-        summary = WeekPlanSummary(
-            id=plan.id,
-            name=plan.name,
-            start_date=plan.start_date,
-            status=plan.status,
-            total_calories=plan.total_calories,
-            total_protein=plan.total_protein,
-            total_carbs=plan.total_carbs,
-            total_fat=plan.total_fat,
-            meal_count=len(plan.meals),
-            created_at=plan.created_at,
-            updated_at=plan.updated_at,
-        )
-        summaries.append(summary)
     
-    return summaries
+    # Rows expose the summary fields as attributes, so validate them directly
+    return [WeekPlanSummary.model_validate(row) for row in result]
 
 
-@router.get("/draft", response_model=WeekPlanResponse | None)
+@router.get(
+    "/draft",
+    response_model=WeekPlanResponse | None,
+    response_model_exclude_none=True,
+)
 async def get_draft_plan(
     db: AsyncSession = Depends(get_db),
 ):
     """Get the current draft week plan (most recent)."""
     result = await db.execute(
-        select(WeekPlan)
+        PLAN_WITH_MEALS
         .where(WeekPlan.status == WeekPlanStatus.DRAFT.value)
         .order_by(WeekPlan.updated_at.desc())
         .limit(1)
@@ -78,14 +87,18 @@ async def get_draft_plan(
     return result.scalar_one_or_none()
 
 
-@router.get("/{plan_id}", response_model=WeekPlanResponse)
+@router.get(
+    "/{plan_id}",
+    response_model=WeekPlanResponse,
+    response_model_exclude_none=True,
+)
 async def get_week_plan(
     plan_id: int,
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific week plan by ID."""
     result = await db.execute(
-        select(WeekPlan).where(WeekPlan.id == plan_id)
+        PLAN_WITH_MEALS.where(WeekPlan.id == plan_id)
     )
     plan = result.scalar_one_or_none()
     
@@ -95,7 +108,11 @@ async def get_week_plan(
     return plan
 
 
-@router.post("/", response_model=WeekPlanResponse)
+@router.post(
+    "/",
+    response_model=WeekPlanResponse,
+    response_model_exclude_none=True,
+)
 async def create_week_plan(
     plan: WeekPlanCreate,
     db: AsyncSession = Depends(get_db),
@@ -132,11 +149,14 @@ async def create_week_plan(
     
     db.add(db_plan)
     await db.commit()
-    await db.refresh(db_plan)
     return db_plan
 
 
-@router.put("/{plan_id}", response_model=WeekPlanResponse)
+@router.put(
+    "/{plan_id}",
+    response_model=WeekPlanResponse,
+    response_model_exclude_none=True,
+)
 async def update_week_plan(
     plan_id: int,
     plan_update: WeekPlanUpdate,
@@ -144,7 +164,7 @@ async def update_week_plan(
 ):
     """Update a week plan."""
     result = await db.execute(
-        select(WeekPlan).where(WeekPlan.id == plan_id)
+        PLAN_WITH_MEALS.where(WeekPlan.id == plan_id)
     )
     plan = result.scalar_one_or_none()
     
@@ -161,7 +181,6 @@ async def update_week_plan(
         plan.notes = plan_update.notes
     
     await db.commit()
-    await db.refresh(plan)
     return plan
 
 
@@ -172,7 +191,7 @@ async def delete_week_plan(
 ):
     """Delete a week plan."""
     result = await db.execute(
-        select(WeekPlan).where(WeekPlan.id == plan_id)
+        PLAN_WITH_MEALS.where(WeekPlan.id == plan_id)
     )
     plan = result.scalar_one_or_none()
     
@@ -225,7 +244,6 @@ async def add_meal_to_plan(
     plan.total_fat += db_meal.fat
     
     await db.commit()
-    await db.refresh(db_meal)
     return db_meal
 
 
@@ -244,25 +262,17 @@ async def clear_day_from_plan(
     if not plan:
         raise HTTPException(status_code=404, detail="Week plan not found")
     
-    # Find all meals for this day
-    meals_result = await db.execute(
-        select(WeekPlanMeal).where(
+    # Delete the day's meals in one statement, then re-sum the plan in SQL
+    deleted = await db.execute(
+        delete(WeekPlanMeal).where(
             WeekPlanMeal.week_plan_id == plan_id,
             WeekPlanMeal.day_index == day_index,
         )
     )
-    meals = meals_result.scalars().all()
-    
-    # Update totals and delete meals
-    for meal in meals:
-        plan.total_calories -= meal.calories
-        plan.total_protein -= meal.protein
-        plan.total_carbs -= meal.carbs
-        plan.total_fat -= meal.fat
-        await db.delete(meal)
+    await WeekPlan.recompute_totals(db, plan_id)
     
     await db.commit()
-    return {"message": f"Cleared {len(meals)} meals from day {day_index}"}
+    return {"message": f"Cleared {deleted.rowcount} meals from day {day_index}"}
 
 
 @router.delete("/{plan_id}/meals/{meal_id}")
@@ -272,20 +282,17 @@ async def remove_meal_from_plan(
     db: AsyncSession = Depends(get_db),
 ):
     """Remove a meal from a week plan."""
+    # Load the meal together with its plan in one round trip
     result = await db.execute(
-        select(WeekPlanMeal)
+        select(WeekPlanMeal, WeekPlan)
+        .join(WeekPlan, WeekPlanMeal.week_plan_id == WeekPlan.id)
         .where(WeekPlanMeal.id == meal_id, WeekPlanMeal.week_plan_id == plan_id)
     )
-    meal = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not meal:
+    if not row:
         raise HTTPException(status_code=404, detail="Meal not found in this plan")
-    
-    # Get plan to update totals
-    plan_result = await db.execute(
-        select(WeekPlan).where(WeekPlan.id == plan_id)
-    )
-    plan = plan_result.scalar_one()
+    meal, plan = row
     
     # Update plan totals
     plan.total_calories -= meal.calories
@@ -306,7 +313,7 @@ async def apply_plan_to_diary(
 ):
     """Apply a week plan to the actual diary (create real meals)."""
     result = await db.execute(
-        select(WeekPlan).where(WeekPlan.id == plan_id)
+        PLAN_WITH_MEALS.where(WeekPlan.id == plan_id)
     )
     plan = result.scalar_one_or_none()
     
@@ -315,29 +322,43 @@ async def apply_plan_to_diary(
     
     meals_created = 0
     
-    for plan_meal in plan.meals:
-        # Calculate the actual date for this meal
-        meal_date = request.target_start_date + timedelta(days=plan_meal.day_index)
-        
-        # Check if a meal already exists for this date and meal type
+    # Actual date of every plan day, computed once
+    day_dates = {
+        plan_meal.day_index: request.target_start_date + timedelta(days=plan_meal.day_index)
+        for plan_meal in plan.meals
+    }
+    meal_keys = {
+        (day_dates[plan_meal.day_index], plan_meal.meal_type) for plan_meal in plan.meals
+    }
+    
+    diary_meal_ids = {}
+    if meal_keys:
+        # Create the diary meals that don't exist yet in one statement; the
+        # unique (date, meal_type) index turns existing or concurrently
+        # created ones into no-ops
+        await db.execute(
+            dialect_insert(Meal)
+            .values([
+                {"date": meal_date, "meal_type": meal_type}
+                for meal_date, meal_type in meal_keys
+            ])
+            .on_conflict_do_nothing()
+        )
         existing_result = await db.execute(
-            select(Meal)
-            .where(Meal.date == meal_date, Meal.meal_type == plan_meal.meal_type)
+            select(Meal.id, Meal.date, Meal.meal_type)
+            .where(Meal.date.in_(day_dates.values()))
         )
-        existing_meal = existing_result.scalar_one_or_none()
-        
-        if not existing_meal:
-            # Create new meal
-            existing_meal = Meal(
-                date=meal_date,
-                meal_type=plan_meal.meal_type,
-            )
-            db.add(existing_meal)
-            await db.flush()
+        diary_meal_ids = {(m.date, m.meal_type): m.id for m in existing_result}
+    
+    # Macros added to each diary meal
+    added_totals = defaultdict(lambda: [0.0, 0.0, 0.0, 0.0])
+    
+    for plan_meal in plan.meals:
+        meal_id = diary_meal_ids[(day_dates[plan_meal.day_index], plan_meal.meal_type)]
         
         # Create meal entry
         entry = MealEntry(
-            meal_id=existing_meal.id,
+            meal_id=meal_id,
             food_id=plan_meal.food_id,
             recipe_id=plan_meal.recipe_id,
             food_name=plan_meal.food_name,
@@ -350,14 +371,33 @@ async def apply_plan_to_diary(
         )
         db.add(entry)
         
-        # Update meal totals
-        existing_meal.total_calories += plan_meal.calories
-        existing_meal.total_protein += plan_meal.protein
-        existing_meal.total_carbs += plan_meal.carbs
-        existing_meal.total_fat += plan_meal.fat
+        totals = added_totals[meal_id]
+        totals[0] += plan_meal.calories
+        totals[1] += plan_meal.protein
+        totals[2] += plan_meal.carbs
+        totals[3] += plan_meal.fat
         
         meals_created += 1
     
+    if added_totals:
+        # Update meal totals in SQL, so concurrent entries cannot overwrite
+        # each other's sums
+        meals = Meal.__table__
+        await db.execute(
+            update(meals)
+            .where(meals.c.id == bindparam("meal_id"))
+            .values(
+                total_calories=meals.c.total_calories + bindparam("calories"),
+                total_protein=meals.c.total_protein + bindparam("protein"),
+                total_carbs=meals.c.total_carbs + bindparam("carbs"),
+                total_fat=meals.c.total_fat + bindparam("fat"),
+            ),
+            [
+                {"meal_id": meal_id, "calories": cal, "protein": pro, "carbs": carb, "fat": fat}
+                for meal_id, (cal, pro, carb, fat) in added_totals.items()
+            ],
+        )
+    
     # Mark plan as active
     plan.status = WeekPlanStatus.ACTIVE.value
     
@@ -371,7 +411,11 @@ async def apply_plan_to_diary(
     }
 
 
-@router.post("/{plan_id}/regenerate-day", response_model=WeekPlanResponse)
+@router.post(
+    "/{plan_id}/regenerate-day",
+    response_model=WeekPlanResponse,
+    response_model_exclude_none=True,
+)
 async def regenerate_day(
     plan_id: int,
     request: RegenerateDayRequest,
@@ -379,7 +423,7 @@ async def regenerate_day(
 ):
     """Regenerate a day (or specific meal) in the week plan using AI."""
     result = await db.execute(
-        select(WeekPlan).where(WeekPlan.id == plan_id)
+        PLAN_WITH_MEALS.where(WeekPlan.id == plan_id)
     )
     plan = result.scalar_one_or_none()
     
@@ -387,30 +431,24 @@ async def regenerate_day(
         raise HTTPException(status_code=404, detail="Week plan not found")
     
     # Get current goal
-    goal_result = await db.execute(
-        select(Goal).where(Goal.is_active == True)
-    )
-    goal = goal_result.scalar_one_or_none()
+    goal = await get_active_goal_targets(db)
     calories = goal.daily_calories if goal else 2000
     protein = goal.daily_protein if goal else 150
     carbs = goal.daily_carbs if goal else 200
     fat = goal.daily_fat if goal else 65
     
     # Get user preferences
-    pref_result = await db.execute(
-        select(UserPreferences).order_by(UserPreferences.id.desc()).limit(1)
-    )
-    user_prefs = pref_result.scalar_one_or_none()
+    user_prefs = await get_latest_preferences(db)
     
     preferences = []
     restrictions = []
     if user_prefs:
         if user_prefs.liked_foods:
-            preferences.extend([f"Include: {food}" for food in user_prefs.liked_foods])
+            preferences.extend(f"Include: {food}" for food in user_prefs.liked_foods)
         if user_prefs.disliked_foods:
-            restrictions.extend([f"Avoid: {food}" for food in user_prefs.disliked_foods])
+            restrictions.extend(f"Avoid: {food}" for food in user_prefs.disliked_foods)
         if user_prefs.allergies:
-            restrictions.extend([f"ALLERGY - must avoid: {a}" for a in user_prefs.allergies])
+            restrictions.extend(f"ALLERGY - must avoid: {a}" for a in user_prefs.allergies)
         if user_prefs.dietary_restrictions:
             diet = user_prefs.dietary_restrictions
             if diet.get("vegan"): restrictions.append("Vegan")
@@ -452,20 +490,13 @@ async def regenerate_day(
     )
     
     # Delete old meals for the day/meal_type
-    old_meals_result = await db.execute(
-        select(WeekPlanMeal).where(
+    await db.execute(
+        delete(WeekPlanMeal).where(
             WeekPlanMeal.week_plan_id == plan_id,
             WeekPlanMeal.day_index == request.day_index,
             WeekPlanMeal.meal_type.in_(meal_types_to_regenerate),
         )
     )
-    old_meals = old_meals_result.scalars().all()
-    for old_meal in old_meals:
-        plan.total_calories -= old_meal.calories
-        plan.total_protein -= old_meal.protein
-        plan.total_carbs -= old_meal.carbs
-        plan.total_fat -= old_meal.fat
-        await db.delete(old_meal)
     
     # Add new meals from AI response
     meal_type_mapping = {
@@ -497,10 +528,6 @@ async def regenerate_day(
                     fat=fat_share,
                 )
                 db.add(new_meal)
-                plan.total_calories += new_meal.calories
-                plan.total_protein += new_meal.protein
-                plan.total_carbs += new_meal.carbs
-                plan.total_fat += new_meal.fat
         else:
             name_attr, desc_attr, factor = meal_type_mapping[mtype]
             food_name = getattr(ai_day, name_attr, "Unknown")
@@ -520,17 +547,23 @@ async def regenerate_day(
                 fat=ai_day.estimated_fat * factor,
             )
             db.add(new_meal)
-            plan.total_calories += new_meal.calories
-            plan.total_protein += new_meal.protein
-            plan.total_carbs += new_meal.carbs
-            plan.total_fat += new_meal.fat
+    
+    # Re-sum the plan in SQL now that the new meals are flushed
+    await db.flush()
+    await WeekPlan.recompute_totals(db, plan_id)
     
     await db.commit()
+    # New meals were added by foreign key and old ones deleted directly, so
+    # reload the plan's meals collection
     await db.refresh(plan)
     return plan
 
 
-@router.post("/from-ai-plan", response_model=WeekPlanResponse)
+@router.post(
+    "/from-ai-plan",
+    response_model=WeekPlanResponse,
+    response_model_exclude_none=True,
+)
 async def create_from_ai_plan(
     request: CreateFromAIPlanRequest,
     db: AsyncSession = Depends(get_db),
@@ -555,9 +588,6 @@ async def create_from_ai_plan(
             meals_list = getattr(day, meal_key, [])
             
             for meal_item in meals_list:
-                food_name = meal_item.get("name", "Unknown")
-                description = meal_item.get("description", "")
-                
                 # Estimate calories from the day if not provided per meal
                 # This is a rough split based on typical meal distribution
                 if meal_key == "breakfast":
@@ -572,8 +602,8 @@ async def create_from_ai_plan(
                 db_meal = WeekPlanMeal(
                     day_index=day_index,
                     meal_type=meal_type,
-                    food_name=food_name,
-                    description=description,
+                    food_name=meal_item.name,
+                    description=meal_item.description,
                     amount=1,
                     unit="serving",
                     calories=day.estimated_calories * cal_factor / max(len(meals_list), 1),
@@ -588,5 +618,4 @@ async def create_from_ai_plan(
     
     db.add(db_plan)
     await db.commit()
-    await db.refresh(db_plan)
     return db_plan
@@ -1,7 +1,7 @@
 """Food-related Pydantic schemas."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class FoodBase(BaseModel):
@@ -35,8 +35,7 @@ class FoodResponse(FoodBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FoodSearchResult(BaseModel):
@@ -62,8 +61,7 @@ class FoodSearchResult(BaseModel):
     # Source tracking
     source: str = "openfoodfacts"  # "openfoodfacts", "cached", "custom"
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FoodCacheResponse(BaseModel):
@@ -95,8 +93,7 @@ class FoodCacheResponse(BaseModel):
     cached_at: datetime
     expires_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FoodCacheUpdate(BaseModel):
@@ -1,7 +1,7 @@
 """Goal-related Pydantic schemas."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class GoalBase(BaseModel):
@@ -34,5 +34,4 @@ class GoalResponse(GoalBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
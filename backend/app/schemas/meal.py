@@ -1,7 +1,7 @@
 """Meal-related Pydantic schemas."""
 
 from datetime import date, datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal
 
 
@@ -34,8 +34,7 @@ class MealEntryResponse(MealEntryBase):
     meal_id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MealBase(BaseModel):
@@ -60,8 +59,7 @@ class MealResponse(MealBase):
     total_fat: float
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DailyMealsResponse(BaseModel):
@@ -1,7 +1,7 @@
 """User preferences Pydantic schemas."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DietaryRestrictions(BaseModel):
@@ -46,5 +46,4 @@ class PreferencesResponse(PreferencesBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,8 @@
 """Recipe-related Pydantic schemas."""
 
 from datetime import datetime
-from pydantic import BaseModel, Field, computed_field
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 
 class RecipeIngredientBase(BaseModel):
@@ -28,8 +29,7 @@ class RecipeIngredientResponse(RecipeIngredientBase):
     id: int
     recipe_id: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class RecipeBase(BaseModel):
@@ -61,23 +61,25 @@ class RecipeResponse(RecipeBase):
     created_at: datetime
     updated_at: datetime
     
+    # Totals are cached so the per-serving fields reuse them instead of
+    # summing the ingredients again during serialization
     @computed_field
-    @property
+    @cached_property
     def total_calories(self) -> float:
         return sum(ing.calories for ing in self.ingredients)
     
     @computed_field
-    @property
+    @cached_property
     def total_protein(self) -> float:
         return sum(ing.protein for ing in self.ingredients)
     
     @computed_field
-    @property
+    @cached_property
     def total_carbs(self) -> float:
         return sum(ing.carbs for ing in self.ingredients)
     
     @computed_field
-    @property
+    @cached_property
     def total_fat(self) -> float:
         return sum(ing.fat for ing in self.ingredients)
     
@@ -101,5 +103,4 @@ class RecipeResponse(RecipeBase):
     def fat_per_serving(self) -> float:
         return self.total_fat / self.servings if self.servings > 0 else 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
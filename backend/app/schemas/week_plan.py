@@ -1,7 +1,7 @@
 """Week plan Pydantic schemas."""
 
 from datetime import date, datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal
 
 
@@ -33,8 +33,7 @@ class WeekPlanMealResponse(WeekPlanMealBase):
     week_plan_id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WeekPlanBase(BaseModel):
@@ -69,8 +68,7 @@ class WeekPlanResponse(WeekPlanBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WeekPlanSummary(BaseModel):
@@ -87,8 +85,7 @@ class WeekPlanSummary(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ApplyToDiaryRequest(BaseModel):
@@ -96,12 +93,18 @@ class ApplyToDiaryRequest(BaseModel):
     target_start_date: date
 
 
+class AIMealItem(BaseModel):
+    """A single meal suggestion within an AI-generated day."""
+    name: str = "Unknown"
+    description: str | None = ""
+
+
 class AIMealPlanDay(BaseModel):
     """A day in an AI-generated meal plan."""
-    breakfast: list[dict] = []
-    lunch: list[dict] = []
-    dinner: list[dict] = []
-    snacks: list[dict] = []
+    breakfast: list[AIMealItem] = []
+    lunch: list[AIMealItem] = []
+    dinner: list[AIMealItem] = []
+    snacks: list[AIMealItem] = []
     estimated_calories: float = 0
     estimated_protein: float = 0
     estimated_carbs: float = 0
@@ -1,8 +1,7 @@
 """Google Gemini AI integration service."""
 
 import json
-import asyncio
-import google.generativeai as genai
+from collections.abc import AsyncIterator
 from typing import Any
 import logging
 
@@ -21,10 +20,23 @@ class GeminiService:
     
     def __init__(self):
         self.settings = get_settings()
-        if self.settings.gemini_api_key:
-            genai.configure(api_key=self.settings.gemini_api_key)
-        # Use gemini-2.5-flash for fast, intelligent responses (stable model)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
+        self._model = None
+    
+    @property
+    def model(self):
+        """Gemini model, created on first use.
+        
+        The SDK is imported here rather than at module level because loading
+        it dominates application start-up time.
+        """
+        if self._model is None:
+            import google.generativeai as genai
+            
+            if self.settings.gemini_api_key:
+                genai.configure(api_key=self.settings.gemini_api_key)
+            # Use gemini-2.5-flash for fast, intelligent responses (stable model)
+            self._model = genai.GenerativeModel("gemini-2.5-flash")
+        return self._model
     
     async def generate_meal_plan(
         self,
@@ -53,6 +65,57 @@ class GeminiService:
         Returns:
             Generated meal plan
         """
+        prompt = self._meal_plan_prompt(
+            calories, protein, carbs, fat, days, preferences, restrictions, language
+        )
+        response = await self._generate_content(prompt)
+        data = self._parse_json_response(response)
+        
+        days_list = [
+            MealPlanDay(**day_data) for day_data in data.get("days", [])
+        ]
+        
+        return MealPlanResponse(
+            days=days_list,
+            notes=data.get("notes"),
+        )
+    
+    async def stream_meal_plan(
+        self,
+        calories: float,
+        protein: float,
+        carbs: float,
+        fat: float,
+        days: int = 7,
+        preferences: list[str] = None,
+        restrictions: list[str] = None,
+        language: str = "en",
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw text of a generated meal plan as the model produces it.
+        
+        Takes the same arguments as generate_meal_plan. The concatenated chunks
+        form the same JSON document (possibly wrapped in a markdown code block)
+        that generate_meal_plan parses.
+        """
+        prompt = self._meal_plan_prompt(
+            calories, protein, carbs, fat, days, preferences, restrictions, language
+        )
+        async for chunk in self._stream_content(prompt):
+            yield chunk
+    
+    def _meal_plan_prompt(
+        self,
+        calories: float,
+        protein: float,
+        carbs: float,
+        fat: float,
+        days: int,
+        preferences: list[str] | None,
+        restrictions: list[str] | None,
+        language: str,
+    ) -> str:
+        """Build the meal plan generation prompt."""
         preferences = preferences or []
         restrictions = restrictions or []
         
@@ -94,18 +157,7 @@ class GeminiService:
         Make the meals varied, practical, and delicious. Include estimated macros for each day.
         Return ONLY the JSON, no additional text.
         """
-        
-        response = await self._generate_content(prompt)
-        data = self._parse_json_response(response)
-        
-        days_list = [
-            MealPlanDay(**day_data) for day_data in data.get("days", [])
-        ]
-        
-        return MealPlanResponse(
-            days=days_list,
-            notes=data.get("notes"),
-        )
+        return prompt
     
     async def generate_single_day(
         self,
@@ -322,17 +374,24 @@ class GeminiService:
     async def _generate_content(self, prompt: str) -> str:
         """Generate content using Gemini model."""
         try:
-            # Run the synchronous API call in a thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.model.generate_content(prompt)
-            )
+            # Use the SDK's native async client so the request doesn't tie up
+            # a thread pool worker for the whole round trip
+            response = await self.model.generate_content_async(prompt)
             return response.text
         except Exception as e:
             logger.error(f"Gemini API error: {e}")
             raise
     
+    async def _stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """Generate content using Gemini model, yielding text as it arrives."""
+        try:
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                yield chunk.text
+        except Exception as e:
+            logger.error(f"Gemini API error: {e}")
+            raise
+    
     def _parse_json_response(self, response: str) -> dict[str, Any]:
         """Parse JSON from Gemini response, handling markdown code blocks."""
         # Clean up response - remove markdown code blocks if present
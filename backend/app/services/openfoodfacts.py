@@ -4,11 +4,16 @@ import httpx
 from typing import Any
 import logging
 
+from app.cache import TTLCache
 from app.config import get_settings
 from app.schemas.food import FoodSearchResult
 
 logger = logging.getLogger(__name__)
 
+# Repeated searches (mostly later pages, which the food_cache table doesn't
+# cover) are served from memory for a short while
+SEARCH_CACHE_TTL_SECONDS = 15 * 60
+
 
 class OpenFoodFactsService:
     """Service for interacting with Open Food Facts API."""
@@ -21,12 +26,32 @@ class OpenFoodFactsService:
         }
         # Longer timeout for Open Food Facts API (can be slow)
         self.timeout = httpx.Timeout(30.0, connect=10.0)
+        self._search_cache = TTLCache(maxsize=512, ttl=SEARCH_CACHE_TTL_SECONDS)
+        self._client: httpx.AsyncClient | None = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, so connections (and TLS sessions) are reused."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def search_products(
         self,
         query: str,
         page: int = 1,
         page_size: int = 20,
+        use_cache: bool = True,
     ) -> list[FoodSearchResult]:
         """
         Search for products by name/brand.
@@ -35,33 +60,42 @@ class OpenFoodFactsService:
             query: Search term
             page: Page number (1-indexed)
             page_size: Results per page
+            use_cache: Return a recent in-memory result if there is one; the
+                fresh result is cached either way
         
         Returns:
             List of food search results
         """
+        cache_key = (query.strip().lower(), page, page_size)
+        if use_cache:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return [result.model_copy() for result in cached]
+        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/cgi/search.pl",
-                    params={
-                        "search_terms": query,
-                        "search_simple": 1,
-                        "action": "process",
-                        "json": 1,
-                        "page": page,
-                        "page_size": page_size,
-                        "fields": "code,product_name,brands,image_front_small_url,"
-                                  "nutriments,nutriscore_grade,nova_group",
-                    },
-                    headers=self.headers,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(
+                f"{self.base_url}/cgi/search.pl",
+                params={
+                    "search_terms": query,
+                    "search_simple": 1,
+                    "action": "process",
+                    "json": 1,
+                    "page": page,
+                    "page_size": page_size,
+                    "fields": "code,product_name,brands,image_front_small_url,"
+                              "nutriments,nutriscore_grade,nova_group",
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
             
             results = []
             for product in data.get("products", []):
                 results.append(self._parse_product(product))
             
+            if results:
+                self._search_cache.set(cache_key, results)
+                return [result.model_copy() for result in results]
             return results
         except httpx.TimeoutException:
             logger.warning(f"Timeout searching Open Food Facts for: {query}")
@@ -81,21 +115,19 @@ class OpenFoodFactsService:
             Food search result or None if not found
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/v2/product/{barcode}.json",
-                    params={
-                        "fields": "code,product_name,brands,image_front_small_url,"
-                                  "nutriments,nutriscore_grade,nova_group",
-                    },
-                    headers=self.headers,
-                )
-                
-                if response.status_code == 404:
-                    return None
-                
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(
+                f"{self.base_url}/api/v2/product/{barcode}.json",
+                params={
+                    "fields": "code,product_name,brands,image_front_small_url,"
+                              "nutriments,nutriscore_grade,nova_group",
+                },
+            )
+            
+            if response.status_code == 404:
+                return None
+            
+            response.raise_for_status()
+            data = response.json()
             
             if data.get("status") != 1:
                 return None
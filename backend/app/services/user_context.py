@@ -0,0 +1,60 @@
+"""Cached lookups of the active goal and user preferences used as AI context."""
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.models.goal import Goal
+from app.models.preferences import UserPreferences
+
+# AI endpoints read these on every request but they rarely change; writes
+# through the goals and preferences endpoints invalidate them immediately
+CONTEXT_CACHE_TTL_SECONDS = 30
+
+LATEST_PREFERENCES = (
+    select(
+        UserPreferences.liked_foods,
+        UserPreferences.disliked_foods,
+        UserPreferences.allergies,
+        UserPreferences.dietary_restrictions,
+        UserPreferences.budget_preference,
+        UserPreferences.max_cooking_time_minutes,
+    )
+    .order_by(UserPreferences.id.desc())
+    .limit(1)
+)
+
+# Distinguishes "nothing cached" from a cached None (no goal / no preferences)
+_MISSING = object()
+
+_goal_cache = TTLCache(maxsize=1, ttl=CONTEXT_CACHE_TTL_SECONDS)
+_preferences_cache = TTLCache(maxsize=1, ttl=CONTEXT_CACHE_TTL_SECONDS)
+
+
+async def get_active_goal_targets(db: AsyncSession) -> Row | None:
+    """Get the active goal's daily targets, cached briefly."""
+    goal = _goal_cache.get("active", _MISSING)
+    if goal is _MISSING:
+        goal = await Goal.get_active_targets(db)
+        _goal_cache.set("active", goal)
+    return goal
+
+
+async def get_latest_preferences(db: AsyncSession) -> Row | None:
+    """Get the prompt-relevant fields of the latest preferences, cached briefly."""
+    preferences = _preferences_cache.get("latest", _MISSING)
+    if preferences is _MISSING:
+        result = await db.execute(LATEST_PREFERENCES)
+        preferences = result.first()
+        _preferences_cache.set("latest", preferences)
+    return preferences
+
+
+def invalidate_goal() -> None:
+    """Drop the cached goal after a goal was written."""
+    _goal_cache.clear()
+
+
+def invalidate_preferences() -> None:
+    """Drop the cached preferences after they were written."""
+    _preferences_cache.clear()